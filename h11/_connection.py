@@ -82,11 +82,13 @@ DEFAULT_MAX_INCOMPLETE_EVENT_SIZE = 16 * 1024
 # - If someone says Connection: close, we will close
 # - If someone uses HTTP/1.0, we will close.
 def _keep_alive(event: Union[Request, Response]) -> bool:
+    # Both Request and Response always have an http_version, and checking it
+    # is cheaper than scanning the headers, so do that first.
+    if event.http_version < b"1.1":
+        return False
     connection = get_comma_header(event.headers, b"connection")
     if b"close" in connection:
         return False
-    if getattr(event, "http_version", b"1.1") < b"1.1":
-        return False
     return True
 
 
@@ -123,16 +125,25 @@ def _body_framing(
         # they can't get into this function in the first place.
         assert event.status_code >= 200
 
+    # Find both framing headers in a single pass. normalize_and_validate has
+    # already lowercased Transfer-Encoding and insisted that it be "chunked",
+    # and collapsed Content-Length down to a single value, so there's no need
+    # to go through get_comma_header for either of them.
+    transfer_encoding = content_length = None
+    for _, name, value in event.headers._full_items:
+        if name == b"transfer-encoding":
+            transfer_encoding = value
+        elif name == b"content-length":
+            content_length = value
+
     # Step 2: check for Transfer-Encoding (T-E beats C-L):
-    transfer_encodings = get_comma_header(event.headers, b"transfer-encoding")
-    if transfer_encodings:
-        assert transfer_encodings == [b"chunked"]
+    if transfer_encoding is not None:
+        assert transfer_encoding == b"chunked"
         return ("chunked", ())
 
     # Step 3: check for Content-Length
-    content_lengths = get_comma_header(event.headers, b"content-length")
-    if content_lengths:
-        return ("content-length", (int(content_lengths[0]),))
+    if content_length is not None:
+        return ("content-length", (int(content_length),))
 
     # Step 4: no applicable headers; fallback/default depends on type
     if type(event) is Request:
@@ -244,18 +255,18 @@ class Connection:
         See :ref:`keepalive-and-pipelining`.
 
         """
-        old_states = dict(self._cstate.states)
+        old_our_state, old_their_state = self.our_state, self.their_state
         self._cstate.start_next_cycle()
         self._request_method = None
         # self.their_http_version gets left alone, since it presumably lasts
         # beyond a single request/response cycle
         assert not self.client_is_waiting_for_100_continue
-        self._respond_to_state_changes(old_states)
+        self._respond_to_state_changes(old_our_state, old_their_state)
 
     def _process_error(self, role: Type[Sentinel]) -> None:
-        old_states = dict(self._cstate.states)
+        old_our_state, old_their_state = self.our_state, self.their_state
         self._cstate.process_error(role)
-        self._respond_to_state_changes(old_states)
+        self._respond_to_state_changes(old_our_state, old_their_state)
 
     def _server_switch_event(self, event: Event) -> Optional[Type[Sentinel]]:
         if type(event) is InformationalResponse and event.status_code == 101:
@@ -271,24 +282,32 @@ class Connection:
     # All events go through here
     def _process_event(self, role: Type[Sentinel], event: Event) -> None:
         # First, pass the event through the state machine to make sure it
-        # succeeds.
-        old_states = dict(self._cstate.states)
-        if role is CLIENT and type(event) is Request:
-            if event.method == b"CONNECT":
+        # succeeds. We only need to remember our and their old states to
+        # know what changed, so read them straight out of the state machine
+        # rather than copying its dict (or going through the properties).
+        states = self._cstate.states
+        old_our_state = states[self.our_role]
+        old_their_state = states[self.their_role]
+        # Look up the event's type once, rather than calling type() again for
+        # each of the checks below.
+        event_type = type(event)
+        if role is CLIENT and event_type is Request:
+            request = cast(Request, event)
+            if request.method == b"CONNECT":
                 self._cstate.process_client_switch_proposal(_SWITCH_CONNECT)
-            if get_comma_header(event.headers, b"upgrade"):
+            if get_comma_header(request.headers, b"upgrade"):
                 self._cstate.process_client_switch_proposal(_SWITCH_UPGRADE)
         server_switch_event = None
         if role is SERVER:
             server_switch_event = self._server_switch_event(event)
-        self._cstate.process_event(role, type(event), server_switch_event)
+        self._cstate.process_event(role, event_type, server_switch_event)
 
         # Then perform the updates triggered by it.
 
-        if type(event) is Request:
-            self._request_method = event.method
+        if event_type is Request:
+            self._request_method = cast(Request, event).method
 
-        if role is self.their_role and type(event) in (
+        if role is self.their_role and event_type in (
             Request,
             Response,
             InformationalResponse,
@@ -302,20 +321,20 @@ class Connection:
         # shows up on a 1xx InformationalResponse. I think the idea is that
         # this is not supposed to happen. In any case, if it does happen, we
         # ignore it.
-        if type(event) in (Request, Response) and not _keep_alive(
+        if event_type in (Request, Response) and not _keep_alive(
             cast(Union[Request, Response], event)
         ):
             self._cstate.process_keep_alive_disabled()
 
         # 100-continue
-        if type(event) is Request and has_expect_100_continue(event):
+        if event_type is Request and has_expect_100_continue(cast(Request, event)):
             self.client_is_waiting_for_100_continue = True
-        if type(event) in (InformationalResponse, Response):
+        if event_type in (InformationalResponse, Response):
             self.client_is_waiting_for_100_continue = False
-        if role is CLIENT and type(event) in (Data, EndOfMessage):
+        if role is CLIENT and event_type in (Data, EndOfMessage):
             self.client_is_waiting_for_100_continue = False
 
-        self._respond_to_state_changes(old_states, event)
+        self._respond_to_state_changes(old_our_state, old_their_state, event)
 
     def _get_io_object(
         self,
@@ -341,13 +360,15 @@ class Connection:
     # self._cstate.states to change.
     def _respond_to_state_changes(
         self,
-        old_states: Dict[Type[Sentinel], Type[Sentinel]],
+        old_our_state: Type[Sentinel],
+        old_their_state: Type[Sentinel],
         event: Optional[Event] = None,
     ) -> None:
         # Update reader/writer
-        if self.our_state != old_states[self.our_role]:
+        states = self._cstate.states
+        if states[self.our_role] is not old_our_state:
             self._writer = self._get_io_object(self.our_role, event, WRITERS)
-        if self.their_state != old_states[self.their_role]:
+        if states[self.their_role] is not old_their_state:
             self._reader = self._get_io_object(self.their_role, event, READERS)
 
     @property
@@ -479,7 +500,7 @@ class Connection:
             raise RemoteProtocolError("Can't receive data when peer state is ERROR")
         try:
             event = self._extract_next_receive_event()
-            if event not in [NEED_DATA, PAUSED]:
+            if event is not NEED_DATA and event is not PAUSED:
                 self._process_event(self.their_role, cast(Event, event))
             if event is NEED_DATA:
                 if len(self._receive_buffer) > self._max_incomplete_event_size:
@@ -646,10 +667,21 @@ class Connection:
 
         if not self._cstate.keep_alive or need_close:
             # Make sure Connection: close is set
-            connection = set(get_comma_header(headers, b"connection"))
-            connection.discard(b"keep-alive")
-            connection.add(b"close")
-            headers = set_comma_header(headers, b"connection", sorted(connection))
+            connection = get_comma_header(headers, b"connection")
+            if not connection:
+                # The usual case: no Connection header at all
+                headers = set_comma_header(headers, b"connection", [b"close"])
+            elif b"close" not in connection or b"keep-alive" in connection:
+                tokens = set(connection)
+                tokens.discard(b"keep-alive")
+                tokens.add(b"close")
+                headers = set_comma_header(headers, b"connection", sorted(tokens))
+            # else: the user already asked for close, so leave it be
+
+        if headers is response.headers:
+            # Nothing needed fixing (e.g. the user set Content-Length on a
+            # keep-alive connection), so there's no need for a new Response.
+            return response
 
         return Response(
             headers=headers,
@@ -109,8 +109,11 @@ class Request(Event):
         # request message that contains more than one Host header field or a
         # Host header field with an invalid field-value."
         # -- https://tools.ietf.org/html/rfc7230#section-5.4
+        #
+        # (We walk _full_items directly: iterating the Headers object goes
+        # through Sequence.__iter__ and a __getitem__ call per header.)
         host_count = 0
-        for name, value in self.headers:
+        for _, name, _ in self.headers._full_items:
             if name == b"host":
                 host_count += 1
         if self.http_version == b"1.1" and host_count == 0:
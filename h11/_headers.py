@@ -263,13 +263,20 @@ def set_comma_header(headers: Headers, name: bytes, new_values: List[bytes]) ->
     # here given the cases where we're using `set_comma_header`...
     #
     # Connection, Content-Length, Transfer-Encoding.
-    new_headers: List[Tuple[bytes, bytes]] = []
-    for found_raw_name, found_name, found_raw_value in headers._full_items:
-        if found_name != name:
-            new_headers.append((found_raw_name, found_raw_value))
-    for new_value in new_values:
-        new_headers.append((name.title(), new_value))
-    return normalize_and_validate(new_headers)
+    #
+    # The entries we keep have already been through normalize_and_validate,
+    # so we carry them over as-is and only normalize the new values, instead
+    # of re-lowercasing and re-validating every header on each call.
+    new_full_items = [item for item in headers._full_items if item[1] != name]
+    if not new_values and len(new_full_items) == len(headers._full_items):
+        # Nothing to remove and nothing to add (e.g. clearing Content-Length
+        # from a response that never had one), so keep the headers we have.
+        return headers
+    if new_values:
+        raw_name = name.title()
+        new_headers = [(raw_name, new_value) for new_value in new_values]
+        new_full_items += normalize_and_validate(new_headers)._full_items
+    return Headers(new_full_items)
 
 
 def has_expect_100_continue(request: "Request") -> bool:
@@ -17,9 +17,21 @@
 # - or, for body readers, a dict of per-framing reader factories
 
 import re
-from typing import Any, Callable, Dict, Iterable, NoReturn, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
-from ._abnf import chunk_header, header_field, request_line, status_line
+from ._abnf import header_field, request_line, status_line
 from ._events import Data, EndOfMessage, InformationalResponse, Request, Response
 from ._receivebuffer import ReceiveBuffer
 from ._state import (
@@ -32,27 +44,28 @@ from ._state import (
     SEND_RESPONSE,
     SERVER,
 )
-from ._util import LocalProtocolError, RemoteProtocolError, Sentinel, validate
+from ._util import LocalProtocolError, RemoteProtocolError, Sentinel
 
 __all__ = ["READERS"]
 
 header_field_re = re.compile(header_field.encode("ascii"))
-obs_fold_re = re.compile(rb"[ \t]+")
+_header_field_fullmatch = header_field_re.fullmatch
 
 
 def _obsolete_line_fold(lines: Iterable[bytes]) -> Iterable[bytes]:
     it = iter(lines)
     last: Optional[bytes] = None
     for line in it:
-        match = obs_fold_re.match(line)
-        if match:
+        # Continuation lines are rare, so test for them with a cheap prefix
+        # check instead of running a regex over every header line.
+        if line.startswith((b" ", b"\t")):
             if last is None:
                 raise LocalProtocolError("continuation line at start of headers")
             if not isinstance(last, bytearray):
                 # Cast to a mutable type, avoiding copy on append to ensure O(n) time
                 last = bytearray(last)
             last += b" "
-            last += line[match.end() :]
+            last += line.lstrip(b" \t")
         else:
             if last is not None:
                 yield last
@@ -62,11 +75,37 @@ def _obsolete_line_fold(lines: Iterable[bytes]) -> Iterable[bytes]:
 
 
 def _decode_header_lines(
+    lines: Sequence[bytes],
+) -> List[Tuple[bytes, bytes]]:
+    # This is the innermost loop of header parsing, so we call the regex
+    # directly instead of going through validate() and building a groupdict
+    # for every line.
+    #
+    # Fast path: an obs-fold continuation line starts with whitespace, so it
+    # can never match header_field on its own. If every line matches, there
+    # is nothing to fold and we can skip _obsolete_line_fold entirely. If any
+    # line doesn't, we start over on the slow path, which also takes care of
+    # raising the appropriate error.
+    headers = []
+    fullmatch = _header_field_fullmatch
+    for line in lines:
+        match = fullmatch(line)
+        if match is None:
+            return _decode_folded_header_lines(lines)
+        headers.append((match["field_name"], match["field_value"]))
+    return headers
+
+
+def _decode_folded_header_lines(
     lines: Iterable[bytes],
-) -> Iterable[Tuple[bytes, bytes]]:
+) -> List[Tuple[bytes, bytes]]:
+    headers = []
     for line in _obsolete_line_fold(lines):
-        matches = validate(header_field_re, line, "illegal header line: {!r}", line)
-        yield (matches["field_name"], matches["field_value"])
+        match = _header_field_fullmatch(line)
+        if match is None:
+            raise LocalProtocolError(f"illegal header line: {line!r}")
+        headers.append((match["field_name"], match["field_value"]))
+    return headers
 
 
 request_line_re = re.compile(request_line.encode("ascii"))
@@ -80,16 +119,45 @@ def maybe_read_from_IDLE_client(buf: ReceiveBuffer) -> Optional[Request]:
         return None
     if not lines:
         raise LocalProtocolError("no request line received")
-    matches = validate(
-        request_line_re, lines[0], "illegal request line: {!r}", lines[0]
-    )
+    # Like _decode_header_lines, read the groups straight off the match
+    # rather than having validate() build a groupdict we only index into.
+    match = request_line_re.fullmatch(lines[0])
+    if match is None:
+        raise LocalProtocolError(f"illegal request line: {lines[0]!r}")
     return Request(
-        headers=list(_decode_header_lines(lines[1:])), _parsed=True, **matches
+        method=match["method"],
+        target=match["target"],
+        http_version=match["http_version"],
+        headers=_decode_header_lines(lines[1:]),
+        _parsed=True,
     )
 
 
 status_line_re = re.compile(status_line.encode("ascii"))
 
+# Most responses start with one of a few status lines, so we look those up
+# directly and only fall back to the regex for everything else.
+_STATUS_LINE_FAST_PATH: Dict[bytes, Tuple[bytes, int, bytes]] = {
+    b"HTTP/%s %d %s" % fields: fields
+    for fields in [
+        (http_version, status_code, reason)
+        for http_version in [b"1.0", b"1.1"]
+        for status_code, reason in [
+            (100, b"Continue"),
+            (101, b"Switching Protocols"),
+            (200, b"OK"),
+            (201, b"Created"),
+            (204, b"No Content"),
+            (301, b"Moved Permanently"),
+            (302, b"Found"),
+            (304, b"Not Modified"),
+            (400, b"Bad Request"),
+            (404, b"Not Found"),
+            (500, b"Internal Server Error"),
+        ]
+    ]
+}
+
 
 def maybe_read_from_SEND_RESPONSE_server(
     buf: ReceiveBuffer,
@@ -101,17 +169,23 @@ def maybe_read_from_SEND_RESPONSE_server(
         return None
     if not lines:
         raise LocalProtocolError("no response line received")
-    matches = validate(status_line_re, lines[0], "illegal status line: {!r}", lines[0])
-    http_version = (
-        b"1.1" if matches["http_version"] is None else matches["http_version"]
-    )
-    reason = b"" if matches["reason"] is None else matches["reason"]
-    status_code = int(matches["status_code"])
+    fast_path = _STATUS_LINE_FAST_PATH.get(bytes(lines[0]))
+    if fast_path is not None:
+        http_version, status_code, reason = fast_path
+    else:
+        match = status_line_re.fullmatch(lines[0])
+        if match is None:
+            raise LocalProtocolError(f"illegal status line: {lines[0]!r}")
+        http_version = (
+            b"1.1" if match["http_version"] is None else match["http_version"]
+        )
+        reason = b"" if match["reason"] is None else match["reason"]
+        status_code = int(match["status_code"])
     class_: Union[Type[InformationalResponse], Type[Response]] = (
         InformationalResponse if status_code < 200 else Response
     )
     return class_(
-        headers=list(_decode_header_lines(lines[1:])),
+        headers=_decode_header_lines(lines[1:]),
         _parsed=True,
         status_code=status_code,
         reason=reason,
@@ -119,6 +193,11 @@ def maybe_read_from_SEND_RESPONSE_server(
     )
 
 
+# Events are immutable, so every body without trailers can share a single
+# EndOfMessage instead of allocating a new one (and its empty Headers).
+_END_OF_MESSAGE = EndOfMessage()
+
+
 class ContentLengthReader:
     def __init__(self, length: int) -> None:
         self._length = length
@@ -126,7 +205,7 @@ class ContentLengthReader:
 
     def __call__(self, buf: ReceiveBuffer) -> Union[Data, EndOfMessage, None]:
         if self._remaining == 0:
-            return EndOfMessage()
+            return _END_OF_MESSAGE
         data = buf.maybe_extract_at_most(self._remaining)
         if data is None:
             return None
@@ -142,7 +221,9 @@ class ContentLengthReader:
         )
 
 
-chunk_header_re = re.compile(chunk_header.encode("ascii"))
+_HEXDIG = b"0123456789abcdefABCDEF"
+# Must match the upper limit in _abnf.chunk_size
+_CHUNK_SIZE_MAX_DIGITS = 20
 
 
 class ChunkedReader:
@@ -155,50 +236,73 @@ class ChunkedReader:
         self._reading_trailer = False
 
     def __call__(self, buf: ReceiveBuffer) -> Union[Data, EndOfMessage, None]:
-        if self._reading_trailer:
-            lines = buf.maybe_extract_lines()
-            if lines is None:
-                return None
-            return EndOfMessage(headers=list(_decode_header_lines(lines)))
-        if self._bytes_to_discard > 0:
-            data = buf.maybe_extract_at_most(self._bytes_to_discard)
-            if data is None:
-                return None
-            self._bytes_to_discard -= len(data)
+        # This is a loop only so that seeing the last chunk can go straight on
+        # to reading the trailer; every other path returns on the first pass.
+        while True:
+            if self._reading_trailer:
+                lines = buf.maybe_extract_lines()
+                if lines is None:
+                    return None
+                if not lines:
+                    # The common case: no trailers
+                    return _END_OF_MESSAGE
+                return EndOfMessage(headers=_decode_header_lines(lines), _parsed=True)
             if self._bytes_to_discard > 0:
+                data = buf.maybe_extract_at_most(self._bytes_to_discard)
+                if data is None:
+                    return None
+                self._bytes_to_discard -= len(data)
+                if self._bytes_to_discard > 0:
+                    return None
+                # else, fall through and read some more
+            assert self._bytes_to_discard == 0
+            if self._bytes_in_chunk == 0:
+                # We need to refill our chunk count
+                chunk_header = buf.maybe_extract_next_line()
+                if chunk_header is None:
+                    return None
+                # This implements _abnf.chunk_header without a regex: split off
+                # any chunk extensions at the first ";", check the size digits
+                # with a single bytes.translate() call, and hand them to int().
+                # We don't parse chunk extensions, but like the grammar we
+                # refuse a bare \n inside them.
+                # XX FIXME: we discard chunk extensions. Does anyone care?
+                chunk_size, semicolon, chunk_ext = chunk_header[:-2].partition(b";")
+                if not semicolon:
+                    chunk_size = chunk_size.rstrip(b" \t")
+                if (
+                    not 0 < len(chunk_size) <= _CHUNK_SIZE_MAX_DIGITS
+                    or chunk_size.translate(None, _HEXDIG)
+                    or b"\n" in chunk_ext
+                ):
+                    raise LocalProtocolError(f"illegal chunk header: {chunk_header!r}")
+                self._bytes_in_chunk = int(chunk_size, base=16)
+                if self._bytes_in_chunk == 0:
+                    self._reading_trailer = True
+                    continue
+                chunk_start = True
+            else:
+                chunk_start = False
+            assert self._bytes_in_chunk > 0
+            if len(buf) >= self._bytes_in_chunk + 2:
+                # The rest of the chunk and its trailing \r\n are both here, so
+                # take them in one go and trim the \r\n off the end (which is
+                # cheap for a bytearray), rather than coming back for it later.
+                data = buf.maybe_extract_at_most(self._bytes_in_chunk + 2)
+                assert data is not None
+                del data[-2:]
+                self._bytes_in_chunk = 0
+                return Data(data=data, chunk_start=chunk_start, chunk_end=True)
+            data = buf.maybe_extract_at_most(self._bytes_in_chunk)
+            if data is None:
                 return None
-            # else, fall through and read some more
-        assert self._bytes_to_discard == 0
-        if self._bytes_in_chunk == 0:
-            # We need to refill our chunk count
-            chunk_header = buf.maybe_extract_next_line()
-            if chunk_header is None:
-                return None
-            matches = validate(
-                chunk_header_re,
-                chunk_header,
-                "illegal chunk header: {!r}",
-                chunk_header,
-            )
-            # XX FIXME: we discard chunk extensions. Does anyone care?
-            self._bytes_in_chunk = int(matches["chunk_size"], base=16)
+            self._bytes_in_chunk -= len(data)
             if self._bytes_in_chunk == 0:
-                self._reading_trailer = True
-                return self(buf)
-            chunk_start = True
-        else:
-            chunk_start = False
-        assert self._bytes_in_chunk > 0
-        data = buf.maybe_extract_at_most(self._bytes_in_chunk)
-        if data is None:
-            return None
-        self._bytes_in_chunk -= len(data)
-        if self._bytes_in_chunk == 0:
-            self._bytes_to_discard = 2
-            chunk_end = True
-        else:
-            chunk_end = False
-        return Data(data=data, chunk_start=chunk_start, chunk_end=chunk_end)
+                self._bytes_to_discard = 2
+                chunk_end = True
+            else:
+                chunk_end = False
+            return Data(data=data, chunk_start=chunk_start, chunk_end=chunk_end)
 
     def read_eof(self) -> NoReturn:
         raise RemoteProtocolError(
@@ -209,13 +313,15 @@ class ChunkedReader:
 
 class Http10Reader:
     def __call__(self, buf: ReceiveBuffer) -> Optional[Data]:
-        data = buf.maybe_extract_at_most(999999999)
+        # Take everything that's buffered: handing over the whole buffer
+        # doesn't copy it, whereas capping the read would mean slicing.
+        data = buf.maybe_extract_at_most(len(buf))
         if data is None:
             return None
         return Data(data=data)
 
     def read_eof(self) -> EndOfMessage:
-        return EndOfMessage()
+        return _END_OF_MESSAGE
 
 
 def expect_nothing(buf: ReceiveBuffer) -> None:
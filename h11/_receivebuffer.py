@@ -1,5 +1,4 @@
 import re
-import sys
 from typing import List, Optional, Union
 
 __all__ = ["ReceiveBuffer"]
@@ -13,38 +12,26 @@ __all__ = ["ReceiveBuffer"]
 # - on average, do this fast
 # - worst case, do this in O(n) where n is the number of bytes processed
 # Plan:
-# - store bytearray, offset, how far we've searched for a separator token
+# - store a bytearray, and how far we've searched for a separator token
 # - use the how-far-we've-searched data to avoid rescanning
-# - while doing a stream of uninterrupted processing, advance offset instead
-#   of constantly copying
-# WARNING:
-# - I haven't benchmarked or profiled any of this yet.
+# - extract data by slicing it off the front of the bytearray
 #
-# Note that starting in Python 3.4, deleting the initial n bytes from a
-# bytearray is amortized O(n), thanks to some excellent work by Antoine
-# Martin:
+# Deleting the initial n bytes from a bytearray is amortized O(n) since
+# Python 3.4, thanks to some excellent work by Antoine Martin:
 #
 #     https://bugs.python.org/issue19087
 #
-# This means that if we only supported 3.4+, we could get rid of the code here
-# involving self._start and self.compress, because it's doing exactly the same
-# thing that bytearray now does internally.
-#
-# BUT unfortunately, we still support 2.7, and reading short segments out of a
-# long buffer MUST be O(bytes read) to avoid DoS issues, so we can't actually
-# delete this code. Yet:
-#
-#     https://pythonclock.org/
-#
-# (Two things to double-check first though: make sure PyPy also has the
-# optimization, and benchmark to make sure it's a win, since we do have a
-# slightly clever thing where we delay calling compress() until we've
-# processed a whole event, which could in theory be slightly more efficient
-# than the internal bytearray support.)
+# Internally, bytearray just advances a start offset and only moves the
+# remaining data once enough of the allocation is wasted, which is exactly the
+# offset-plus-compress() scheme we used to maintain by hand for Python 2.7.
+# So reading short segments out of a long buffer stays O(bytes read) without
+# us tracking an offset, and we don't do a memmove per extraction.
 blank_line_regex = re.compile(b"\n\r?\n", re.MULTILINE)
 
 
 class ReceiveBuffer:
+    __slots__ = ("_data", "_next_line_search", "_multiple_lines_search")
+
     def __init__(self) -> None:
         self._data = bytearray()
         self._next_line_search = 0
@@ -78,10 +65,19 @@ class ReceiveBuffer:
         """
         Extract a fixed number of bytes from the buffer.
         """
-        out = self._data[:count]
-        if not out:
+        if not self._data or count <= 0:
             return None
 
+        if count >= len(self._data):
+            # We're handing out everything we have (the usual case when
+            # reading a body), so give away the buffer itself instead of
+            # copying it.
+            out = self._data
+            self._data = bytearray()
+            self._next_line_search = 0
+            self._multiple_lines_search = 0
+            return out
+
         return self._extract(count)
 
     def maybe_extract_next_line(self) -> Optional[bytearray]:
@@ -106,11 +102,11 @@ class ReceiveBuffer:
         Extract everything up to the first blank line, and return a list of lines.
         """
         # Handle the case where we have an immediate empty line.
-        if self._data[:1] == b"\n":
+        if self._data.startswith(b"\n"):
             self._extract(1)
             return []
 
-        if self._data[:2] == b"\r\n":
+        if self._data.startswith(b"\r\n"):
             self._extract(2)
             return []
 
@@ -123,11 +119,10 @@ class ReceiveBuffer:
         # Truncate the buffer and return it.
         idx = match.span(0)[-1]
         out = self._extract(idx)
-        lines = out.split(b"\n")
-
-        for line in lines:
-            if line.endswith(b"\r"):
-                del line[-1]
+        # Lines may end in either \r\n or \n. Normalizing the line endings
+        # first lets us split in C, instead of looping over the lines in
+        # Python to strip each one's \r.
+        lines = out.replace(b"\r\n", b"\n").split(b"\n")
 
         assert lines[-2] == lines[-1] == b""
 
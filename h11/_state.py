@@ -247,6 +247,8 @@ STATE_TRIGGERED_TRANSITIONS: StateTransitionType = {
 
 
 class ConnectionState:
+    __slots__ = ("keep_alive", "pending_switch_proposals", "states")
+
     def __init__(self) -> None:
         # Extra bits of state that don't quite fit into the state model.
 
@@ -333,6 +333,23 @@ def test_automatic_transfer_encoding_in_response() -> None:
         assert c.send(Data(data=b"12345")) == b"12345"
 
 
+def test_response_headers_left_alone_when_already_correct() -> None:
+    c = Connection(SERVER)
+    receive_and_get(c, b"GET / HTTP/1.1\r\nHost: example.com\r\n\r\n")
+    response = Response(status_code=200, headers=[("Content-Length", "5")])
+    assert c._clean_up_response_headers_for_sending(response) is response
+
+    # Including when we must close and the user already said so
+    c = Connection(SERVER)
+    receive_and_get(
+        c, b"GET / HTTP/1.1\r\nHost: example.com\r\nConnection: close\r\n\r\n"
+    )
+    response = Response(
+        status_code=200, headers=[("Content-Length", "5"), ("Connection", "close")]
+    )
+    assert c._clean_up_response_headers_for_sending(response) is response
+
+
 def test_automagic_connection_close_handling() -> None:
     p = ConnectionPair()
     # If the user explicitly sets Connection: close, then we notice and
@@ -365,6 +382,45 @@ def test_automagic_connection_close_handling() -> None:
         assert conn.states == {CLIENT: MUST_CLOSE, SERVER: MUST_CLOSE}
 
 
+def test_automagic_connection_close_merges_user_tokens() -> None:
+    # When we have to close, any Connection tokens the user set are merged
+    # with "close": keep-alive is dropped, and anything else is kept
+    http10_request = b"GET / HTTP/1.0\r\n\r\n"
+    close_request = b"GET / HTTP/1.1\r\nHost: example.com\r\nConnection: close\r\n\r\n"
+    for request, user_connection, expected in [
+        (
+            http10_request,
+            "keep-alive",
+            b"Content-Length: 0\r\nConnection: close\r\n",
+        ),
+        (
+            close_request,
+            "upgrade",
+            b"Content-Length: 0\r\nConnection: close\r\nConnection: upgrade\r\n",
+        ),
+        # Already saying close doesn't save a keep-alive token from removal
+        (
+            http10_request,
+            "close, keep-alive",
+            b"Content-Length: 0\r\nConnection: close\r\n",
+        ),
+        # But if the user's tokens already say close and nothing contradicts
+        # it, their header is sent exactly as they wrote it
+        (
+            http10_request,
+            "Upgrade, close",
+            b"connection: Upgrade, close\r\nContent-Length: 0\r\n",
+        ),
+    ]:
+        c = Connection(SERVER)
+        receive_and_get(c, request)
+        response = Response(
+            status_code=200,
+            headers=[("connection", user_connection), ("Content-Length", "0")],
+        )
+        assert c.send(response) == b"HTTP/1.1 200 \r\n" + expected + b"\r\n"
+
+
 def test_100_continue() -> None:
     def setup() -> ConnectionPair:
         p = ConnectionPair()
@@ -127,6 +127,17 @@ def test_get_set_comma_header() -> None:
         (b"newthing", b"b"),
         (b"whatever", b"different thing"),
     ]
+    # Untouched headers keep their original casing
+    assert headers.raw_items() == [
+        (b"Connection", b"close"),
+        (b"connectiON", b"fOo,, , BAR"),
+        (b"Newthing", b"a"),
+        (b"Newthing", b"b"),
+        (b"Whatever", b"different thing"),
+    ]
+
+    # Clearing a header that isn't there leaves the headers untouched
+    assert set_comma_header(headers, b"content-length", []) is headers
 
 
 def test_has_100_continue() -> None:
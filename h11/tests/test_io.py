@@ -1,7 +1,9 @@
+import re
 from typing import Any, Callable, Generator, List
 
 import pytest
 
+from .._abnf import chunk_header
 from .._events import (
     Data,
     EndOfMessage,
@@ -13,10 +15,12 @@ from .._events import (
 from .._headers import Headers, normalize_and_validate
 from .._readers import (
     _obsolete_line_fold,
+    _STATUS_LINE_FAST_PATH,
     ChunkedReader,
     ContentLengthReader,
     Http10Reader,
     READERS,
+    status_line_re,
 )
 from .._receivebuffer import ReceiveBuffer
 from .._state import CLIENT, IDLE, SEND_RESPONSE, SERVER
@@ -326,6 +330,15 @@ def test__obsolete_line_fold_bytes() -> None:
     ]
 
 
+def test_status_line_fast_path_matches_regex() -> None:
+    for line, (http_version, status_code, reason) in _STATUS_LINE_FAST_PATH.items():
+        matches = status_line_re.fullmatch(line)
+        assert matches is not None
+        assert matches["http_version"] == http_version
+        assert int(matches["status_code"]) == status_code
+        assert matches["reason"] == reason
+
+
 def _run_reader_iter(
     reader: Any, buf: bytes, do_eof: bool
 ) -> Generator[Any, None, None]:
@@ -432,6 +445,10 @@ def test_ChunkedReader() -> None:
     # refuses garbage in the chunk count
     with pytest.raises(LocalProtocolError):
         t_body_reader(ChunkedReader, b"10\x00\r\nxxx", None)
+    # ...including things that int(..., 16) would otherwise accept
+    for bad in [b"0x10", b"+10", b"1_0", b" 10", b""]:
+        with pytest.raises(LocalProtocolError):
+            t_body_reader(ChunkedReader, bad + b"\r\nxxx", None)
 
     # handles (and discards) "chunk extensions" omg wtf
     t_body_reader(
@@ -450,6 +467,34 @@ def test_ChunkedReader() -> None:
     )
 
 
+def test_ChunkedReader_matches_chunk_header_grammar() -> None:
+    chunk_header_re = re.compile(chunk_header.encode("ascii"))
+    for header in [
+        b"a",
+        b"0A  ",
+        b"1" * 20,
+        b"1" * 21,
+        b"5;",
+        b"5; name=value",
+        b"5;\x00\r\t ",
+        b"5;a\nb",
+        b"5 ;a",
+        b";a",
+        b"5\n",
+        b"x5",
+        b"0x5",
+    ]:
+        header += b"\r\n"
+        match = chunk_header_re.fullmatch(header)
+        reader = ChunkedReader()
+        if match is None:
+            with pytest.raises(LocalProtocolError):
+                reader(makebuf(header))
+        else:
+            reader(makebuf(header))
+            assert reader._bytes_in_chunk == int(match["chunk_size"], 16)
+
+
 def test_ContentLengthWriter() -> None:
     w = ContentLengthWriter(5)
     assert dowrite(w, Data(data=b"123")) == b"123"
@@ -32,6 +32,16 @@ def test_receivebuffer() -> None:
     assert b.maybe_extract_at_most(10) is None
     assert not b
 
+    # Draining the whole buffer hands over the data without sharing it
+    b += b"456"
+    out = b.maybe_extract_at_most(3)
+    assert out == b"456"
+    b += b"789"
+    assert out == b"456"
+    assert bytes(b) == b"789"
+    assert b.maybe_extract_at_most(10) == b"789"
+    assert not b
+
     ################################################################
     # maybe_extract_until_next
     ################################################################
@@ -83,6 +93,11 @@ def test_receivebuffer() -> None:
     assert b.maybe_extract_lines() == []
     assert bytes(b) == b"trailing"
 
+    # Only a single \r is stripped from the end of each line
+    b += b"\r\na\r\r\nb\n\r\n"
+    assert b.maybe_extract_lines() == [b"trailing", b"a\r", b"b"]
+    assert not b
+
 
 @pytest.mark.parametrize(
     "data",